@@ -1,6 +1,7 @@
 from __future__ import annotations
 from typing import Dict, List, Tuple
 import numpy as np
+import scipy.sparse as sp
 
 from lake_mdp import ABSORB
 from policy import Policy
@@ -33,7 +34,7 @@ def enumerate_states(mdp) -> List[object]:
 
 def build_policy_Pr(
     mdp, policy: Policy, states: List[object]
-) -> Tuple[np.ndarray, np.ndarray]:
+) -> Tuple[sp.csr_matrix, np.ndarray]:
     """
     Build the policy-induced transition matrix P and reward vector r for a fixed policy.
 
@@ -41,45 +42,61 @@ def build_policy_Pr(
     r[i]    = reward(states[i]) using the environment's reward convention (on entry).
 
     Terminal/absorbing states are detected via actions(s) == [ABSORB] and given a self-loop.
+
+    P is returned in CSR format since each row only has a few nonzeros.
     """
     S = len(states)
     index: Dict[object, int] = {s: i for i, s in enumerate(states)}
-    P = np.zeros((S, S), dtype=float)
+    # CSR triplets, built row by row: each row has only a handful of successors.
+    indptr: List[int] = [0]
+    indices: List[int] = []
+    data: List[float] = []
 
     for s in states:
         i = index[s]
+        row: Dict[int, float] = {}
 
         acts = list(mdp.actions(s))
         if acts == [ABSORB]:
             absorb_idx = index[(ABSORB, ABSORB)]
-            P[i, absorb_idx] = 1.0
-            continue
-
-        # Optional stochastic policies via action_probs(s)
-        probs = None
-        ap = getattr(policy, "action_probs", None)
-        if callable(ap):
-            pa = ap(s)
-            if pa is not None:
-                # validate once and reuse
-                probs = {a: float(pa[a]) for a in pa if pa[a] > 0.0}
-
-        if probs is None:
-            a = policy(s)
-            for ns, p in mdp.transition(s, a):
-                P[i, index[ns]] += float(p)
+            row[absorb_idx] = 1.0
         else:
-            for a, pa in probs.items():
-                if pa <= 0.0:
-                    continue
+            # Optional stochastic policies via action_probs(s)
+            probs = None
+            ap = getattr(policy, "action_probs", None)
+            if callable(ap):
+                pa = ap(s)
+                if pa is not None:
+                    # validate once and reuse
+                    probs = {a: float(pa[a]) for a in pa if pa[a] > 0.0}
+
+            if probs is None:
+                a = policy(s)
                 for ns, p in mdp.transition(s, a):
-                    P[i, index[ns]] += float(pa) * float(p)
+                    j = index[ns]
+                    row[j] = row.get(j, 0.0) + float(p)
+            else:
+                for a, pa in probs.items():
+                    if pa <= 0.0:
+                        continue
+                    for ns, p in mdp.transition(s, a):
+                        j = index[ns]
+                        row[j] = row.get(j, 0.0) + float(pa) * float(p)
+
+            # Defensive normalization (handles tiny drift)
+            row_sum = sum(row.values())
+            if row_sum > 0 and abs(row_sum - 1.0) > 1e-8:
+                row = {j: p / row_sum for j, p in row.items()}
 
-        # Defensive normalization (handles tiny drift)
-        row_sum = P[i].sum()
-        if row_sum > 0 and abs(row_sum - 1.0) > 1e-8:
-            P[i] /= row_sum
+        for j in sorted(row):
+            indices.append(j)
+            data.append(row[j])
+        indptr.append(len(indices))
 
+    P = sp.csr_matrix(
+        (np.array(data, dtype=float), np.array(indices), np.array(indptr)),
+        shape=(S, S),
+    )
     rewards = np.array([mdp.reward(sj) for sj in states], dtype=float)
     r = P @ rewards
     return P, r
@@ -1,6 +1,6 @@
 from __future__ import annotations
-from typing import Dict, List, Tuple
-import math
+from typing import Dict, List, Optional, Tuple
+from operator import itemgetter
 import numpy as np
 
 from policy import Policy
@@ -13,6 +13,8 @@ try:
 except Exception:
     UP, RIGHT, DOWN, LEFT, ABSORB = "UP", "RIGHT", "DOWN", "LEFT", "⊥"
 
+_ACTIONS: Tuple[Action, ...] = (UP, RIGHT, DOWN, LEFT)
+
 
 class MyPolicy(Policy):
     """
@@ -24,12 +26,14 @@ class MyPolicy(Policy):
       2) Build a directed graph: for each (state, action), connect to the
          most likely successor under mdp.transition(s, a).
       3) Reverse-BFS from all goals to compute a discrete distance d(s).
-      4) For each non-terminal state s, choose the action minimizing d(next).
+      4) For each non-terminal state s, choose the legal action (among
+         UP/RIGHT/DOWN/LEFT in mdp.actions(s)) minimizing d(next).
          Tie-break with a fixed action order.
 
     Notes:
-      • Holes are treated as terminals and are not seeded in BFS, so d(H)=∞,
-        which naturally discourages stepping into holes unless unavoidable.
+      • Holes are treated as terminals and are not seeded in BFS, so d(H)=∞
+        (stored as the int32 sentinel S+1), which naturally discourages
+        stepping into holes unless unavoidable.
       • Absorbing and goals get d=0.
     """
 
@@ -38,14 +42,20 @@ class MyPolicy(Policy):
         mdp: MDP,
         rng: np.random.Generator,
         tie_break: Tuple[Action, ...] = (RIGHT, DOWN, LEFT, UP),
+        states: Optional[List[State]] = None,
+        state_idx: Optional[Dict[State, int]] = None,
     ):
         super().__init__(mdp, rng)
         self.mdp = mdp
         self.rng = rng
         self.tie_break = tie_break
-        self._states: List[State] = []
-        self._state_idx: Dict[State, int] = {}
+        self._tb_rank: Dict[Action, int] = {a: i for i, a in enumerate(tie_break)}
+        # Callers that already enumerated the MDP (e.g. run) can pass the
+        # states and their index to skip a second traversal in _build.
+        self._states: List[State] = states if states is not None else []
+        self._state_idx: Dict[State, int] = state_idx if state_idx is not None else {}
         self._policy: Dict[State, Action] = {}
+        self._succ: Dict[Tuple[State, Action], State] = {}
         self._build()
 
 
@@ -53,53 +63,75 @@ class MyPolicy(Policy):
         return self._policy.get(s, ABSORB)        
 
     def _most_likely_successor(self, s: State, a: Action) -> State:
-        succs = self.mdp.transition(s, a)
-        if succs:
-            return max(succs, key=lambda x: x[1])[0]
-        return s 
+        s_next = self._succ.get((s, a))
+        if s_next is None:
+            succs = self.mdp.transition(s, a)
+            s_next = max(succs, key=itemgetter(1))[0] if succs else s
+            self._succ[(s, a)] = s_next
+        return s_next
 
     def _build(self) -> None:
-        self._states = list(enumerate_states(self.mdp))
+        if not self._states:
+            self._states = list(enumerate_states(self.mdp))
+        if len(self._state_idx) != len(self._states):
+            self._state_idx = {s: i for i, s in enumerate(self._states)}
         self._policy: Dict[State, Action] = {}
+        self._succ = {}
+        S = len(self._states)
+        # Hop counts never exceed S, so S + 1 marks states that cannot reach a goal.
+        INF = S + 1
+
+        is_terminal = np.array(
+            [self.mdp.is_terminal(s) for s in self._states], dtype=bool
+        )
+        is_hole = np.array([s[1] == "H" for s in self._states], dtype=bool)
+
+        # succ_idx[i, c]: index of the most likely successor of state i under
+        # _ACTIONS[c] (memoized in self._succ), plus its reverse adjacency so
+        # the BFS touches each edge exactly once. legal[i, c] records whether
+        # _ACTIONS[c] is in mdp.actions(s); only legal edges are built.
+        succ_idx = np.full((S, len(_ACTIONS)), -1, dtype=np.int32)
+        legal = np.zeros((S, len(_ACTIONS)), dtype=bool)
+        predecessors: List[List[int]] = [[] for _ in range(S)]
+        for i, s in enumerate(self._states):
+            if is_terminal[i]:
+                continue
+            allowed = set(self.mdp.actions(s))
+            for c, a in enumerate(_ACTIONS):
+                if a not in allowed:
+                    continue
+                legal[i, c] = True
+                j = self._state_idx[self._most_likely_successor(s, a)]
+                succ_idx[i, c] = j
+                predecessors[j].append(i)
+
+        d = np.full(S, INF, dtype=np.int32)
+        goals = [i for i, s in enumerate(self._states) if s[1] == "G" or s[1] == "⊥"]
+        d[goals] = 0
+        queue = deque(goals)
 
-        d = {s: math.inf for s in self._states}
-        queue = deque()
-
-        for s in self._states:
-            if s[1] == "G" or s[1] == "⊥":
-                d[s] = 0
-                queue.append(s)
-            
         while queue:
-            s_next = queue.popleft()
-            for s in self._states:
-                for a in [UP, RIGHT, DOWN, LEFT]:
-                    if self.mdp.is_terminal(s):
-                        continue
-                    if self._most_likely_successor(s, a) == s_next:
-                        if d[s] > d[s_next] + 1:
-                            d[s] = d[s_next] + 1
-                            queue.append(s)
-
-        for s in self._states:
-            if self.mdp.is_terminal(s):
-                continue
-            best_a = None
-            best_d = math.inf
-            for a in self.mdp.actions(s):
-                s_next = self._most_likely_successor(s, a)
-
-                if s_next[1] == "H":
-                    candidate_d = math.inf
-                else:
-                    candidate_d = d[s_next]
-
-                if candidate_d < best_d or (
-                    candidate_d == best_d
-                    and (best_a is None or self.tie_break.index(a) < self.tie_break.index(best_a))
-                ):
-                    best_d = candidate_d
-                    best_a = a
-
-            if best_a is not None:
-                self._policy[s] = best_a
+            j = queue.popleft()
+            for i in predecessors[j]:
+                if d[i] == INF:
+                    d[i] = d[j] + 1
+                    queue.append(i)
+
+        # Columns in tie-break order, so argmin's first minimum is the winner.
+        order = np.array(
+            sorted(
+                range(len(_ACTIONS)),
+                key=lambda c: self._tb_rank.get(_ACTIONS[c], len(self._tb_rank)),
+            )
+        )
+        # Illegal actions get INF + 1 so argmin never picks them; states
+        # with no legal action among _ACTIONS get no entry (ABSORB).
+        active = np.flatnonzero(~is_terminal & legal.any(axis=1))
+        succ = succ_idx[active][:, order]
+        candidate_d = np.where(is_hole[succ], INF, d[succ])
+        candidate_d = np.where(legal[active][:, order], candidate_d, INF + 1)
+        best_col = order[np.argmin(candidate_d, axis=1)]
+        self._policy = {
+            self._states[i]: _ACTIONS[c]
+            for i, c in zip(active.tolist(), best_col.tolist())
+        }
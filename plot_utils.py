@@ -1,6 +1,7 @@
 # plot_utils.py
 from __future__ import annotations
 import matplotlib.pyplot as plt
+import numpy as np
 
 # Import env action constants (works if they are defined; otherwise we compare by string)
 try:
@@ -16,6 +17,13 @@ ACTION_TO_ARROW = {
     "LEFT": "←",
 }
 
+# Colors of the special cells; every other cell is white with a black arrow
+CELL_COLORS = {
+    "S": (1.0, 0.6, 0.0),  # orange
+    "H": (0.2, 0.4, 1.0),  # blue
+    "G": (0.0, 0.7, 0.0),  # green
+}
+
 
 def _action_name(a):
     """Normalize an action object to 'UP'/'RIGHT'/'DOWN'/'LEFT' when possible."""
@@ -45,7 +53,7 @@ def plot_policy(policy, ax=None):
     Assumptions:
       - policy is callable on a *state* s and exposes `policy.mdp`
       - `policy.mdp.grid` is a list[list[str]] with characters in {'S','F','H','G'}
-      - states are addressed as (i, j) tuples when calling policy((i, j))
+      - states are addressed as ((i, j), ch) when calling policy(((i, j), ch))
     """
     mdp = policy.mdp
     grid = mdp.grid
@@ -56,51 +64,43 @@ def plot_policy(policy, ax=None):
         fig, ax = plt.subplots(figsize=(5, 5), facecolor="white")
         ax.set_facecolor("white")
 
-    # Iterate rows/cols once: draw cell + add character (letter or arrow)
-    for i in range(m):
-        for j in range(n):
-            ch = grid[i][j]
+    # Ask the policy once per cell, up front; S/H/G cells show their letter.
+    labels = [
+        [
+            grid[i][j]
+            if grid[i][j] in CELL_COLORS
+            else ACTION_TO_ARROW.get(_action_name(policy(((i, j), grid[i][j]))), "·")
+            for j in range(n)
+        ]
+        for i in range(m)
+    ]
 
-            # choose cell color
-            if ch == "S":
-                color, txt, txt_color = (1.0, 0.6, 0.0), "S", "white"  # orange
-            elif ch == "H":
-                color, txt, txt_color = (0.2, 0.4, 1.0), "H", "white"  # blue
-            elif ch == "G":
-                color, txt, txt_color = (0.0, 0.7, 0.0), "G", "white"  # green
-            else:
-                # Free cell: white, text decided by the policy
-                color, txt, txt_color = (1.0, 1.0, 1.0), None, "black"
+    # Color every cell with a single RGB image instead of one patch per cell.
+    kinds = np.asarray(grid).reshape(m, n)
+    color_array = np.ones((m, n, 3))  # free cells stay white
+    for ch, color in CELL_COLORS.items():
+        color_array[kinds == ch] = color
+    ax.imshow(
+        color_array,
+        origin="upper",
+        extent=(0, n, m, 0),
+        interpolation="nearest",
+    )
+    ax.set_autoscale_on(False)
+    ax.hlines(range(m + 1), 0, n, colors="lightgray", linewidth=1.0)
+    ax.vlines(range(n + 1), 0, m, colors="lightgray", linewidth=1.0)
 
-            # draw the box
-            ax.add_patch(
-                plt.Rectangle(
-                    (j, i), 1, 1, facecolor=color, edgecolor="lightgray", linewidth=1.0
-                )
-            )
-
-            # decide the character to place
-            if txt is None:
-                # ask the policy for this state's action, then map to arrow
-                s = (i, j)
-                try:
-                    a = policy((s, ch))
-                    print(f"Policy action at state {s}: {a}")
-                except Exception:
-                    print(f"Policy action at state {s}: <error>")
-                    a = None
-                name = _action_name(a)
-                txt = ACTION_TO_ARROW.get(name, "·")  # dot if unknown / ABSORB
-
-            # put the character in the center
+    # put the character in the center of each cell
+    for i in range(m):
+        for j in range(n):
             ax.text(
                 j + 0.5,
                 i + 0.55,
-                txt,
+                labels[i][j],
                 ha="center",
                 va="center",
                 fontsize=14,
-                color=txt_color,
+                color="white" if grid[i][j] in CELL_COLORS else "black",
                 weight="bold",
             )
 
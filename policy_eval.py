@@ -1,7 +1,97 @@
 from __future__ import annotations
+from typing import Optional
 import numpy as np
+import scipy.sparse as sp
 
-from bellman import bellman_update
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; fall back to the NumPy loop
+    njit = None
+
+
+if njit is not None:
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _pe_loop(P, r, v0, gamma, tol, max_iters, check_every):
+        """Fused dense Bellman iteration: one pass over P per sweep, rows in parallel."""
+        S = r.shape[0]
+        v = v0.copy()
+        v_new = np.empty(S)
+        diff = np.empty(S)
+        for it in range(max_iters):
+            check = (it + 1) % check_every == 0
+            for i in prange(S):
+                acc = 0.0
+                for j in range(S):
+                    acc += P[i, j] * v[j]
+                v_new[i] = r[i] + gamma * acc
+                if check:
+                    diff[i] = abs(v_new[i] - v[i])
+            if check and diff.max() < tol:
+                break
+            v, v_new = v_new, v
+        return v
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _pe_csr(indptr, indices, data, r, v0, gamma, tol, max_iters, check_every):
+        """Same as _pe_loop but only visits the nonzeros of a CSR matrix."""
+        S = r.shape[0]
+        v = v0.copy()
+        v_new = np.empty(S)
+        diff = np.empty(S)
+        for it in range(max_iters):
+            check = (it + 1) % check_every == 0
+            for i in prange(S):
+                acc = 0.0
+                for k in range(indptr[i], indptr[i + 1]):
+                    acc += data[k] * v[indices[k]]
+                v_new[i] = r[i] + gamma * acc
+                if check:
+                    diff[i] = abs(v_new[i] - v[i])
+            if check and diff.max() < tol:
+                break
+            v, v_new = v_new, v
+        return v
+
+    @njit(fastmath=True, cache=True)
+    def _gs_sweep(P, r, gamma, v):
+        """One in-place Gauss-Seidel sweep over dense P; returns max |change|."""
+        S = r.shape[0]
+        max_diff = 0.0
+        for i in range(S):
+            acc = 0.0
+            for j in range(S):
+                acc += P[i, j] * v[j]
+            new = r[i] + gamma * acc
+            d = abs(new - v[i])
+            if d > max_diff:
+                max_diff = d
+            v[i] = new
+        return max_diff
+
+    @njit(fastmath=True, cache=True)
+    def _gs_sweep_csr(indptr, indices, data, r, gamma, v):
+        """Same as _gs_sweep but only visits the nonzeros of a CSR matrix."""
+        S = r.shape[0]
+        max_diff = 0.0
+        for i in range(S):
+            acc = 0.0
+            for k in range(indptr[i], indptr[i + 1]):
+                acc += data[k] * v[indices[k]]
+            new = r[i] + gamma * acc
+            d = abs(new - v[i])
+            if d > max_diff:
+                max_diff = d
+            v[i] = new
+        return max_diff
+
+
+# The Jacobi loops only test convergence every this many sweeps; the extra
+# sweeps past the stopping point only tighten the estimate.
+_CHECK_EVERY = 16
+
+# Dense P with fewer than this many nonzeros per row is evaluated as CSR.
+_SPARSE_ROW_NNZ = 8
 
 
 def iterative_policy_evaluation(
@@ -10,6 +100,8 @@ def iterative_policy_evaluation(
     gamma: float,
     eps: float = 1e-6,
     max_iters: int = 100000,
+    v0: Optional[np.ndarray] = None,
+    sweep: str = "gauss-seidel",
 ) -> np.ndarray:
     """
     Iterative (incremental) policy evaluation via repeated Bellman updates.
@@ -17,26 +109,89 @@ def iterative_policy_evaluation(
 
     Parameters
     ----------
-    P : (S,S) array (row-stochastic)
+    P : (S,S) array or scipy.sparse matrix (row-stochastic)
     r : (S,) array
     gamma : float in (0,1]
     eps : float
         Target error tolerance (on true error via slide bound).
     max_iters : int
+    v0 : (S,) array, optional
+        Initial value estimate (warm start), e.g. the value of a previously
+        evaluated, similar policy. The update contracts the error by gamma per
+        sweep, so the iteration count scales with log(||v0 - v||) and a close
+        v0 saves about log(2)/log(1/gamma) sweeps per halving of that error.
+        Defaults to zeros.
+    sweep : {"gauss-seidel","jacobi"}
+        "gauss-seidel" updates v in place, so each state already sees the new
+        values of the states before it in the same sweep and typically needs
+        about half the sweeps. "jacobi" updates all states from the previous
+        sweep and parallelizes over rows. Gauss-Seidel needs numba; without
+        it the Jacobi NumPy loop is used.
 
     Returns
     -------
     v : (S,) array
     """
-    P = np.asarray(P)
-    r = np.asarray(r)
+    if sp.issparse(P):
+        P = P.tocsr()
+    else:
+        P = np.asarray(P, dtype=float)
+    r = np.asarray(r, dtype=float)
     gamma = float(gamma)
+    tol = eps * (1 - gamma) / gamma
+
+    if v0 is not None and np.shape(v0) == r.shape:
+        v = np.array(v0, dtype=r.dtype)
+    else:
+        v = np.zeros_like(r)
+
+    if sweep not in ("gauss-seidel", "jacobi"):
+        raise ValueError(f"Unknown sweep '{sweep}'")
+
+    S = r.shape[0]
+    if njit is not None and S > 0:
+        if not sp.issparse(P) and np.count_nonzero(P) < _SPARSE_ROW_NNZ * S:
+            P = sp.csr_matrix(P)
+        if sp.issparse(P):
+            indptr = np.ascontiguousarray(P.indptr)
+            indices = np.ascontiguousarray(P.indices)
+            data = np.ascontiguousarray(P.data, dtype=float)
+        else:
+            P = np.ascontiguousarray(P)
+
+        if sweep == "gauss-seidel":
+            for _ in range(max_iters):
+                if sp.issparse(P):
+                    max_diff = _gs_sweep_csr(indptr, indices, data, r, gamma, v)
+                else:
+                    max_diff = _gs_sweep(P, r, gamma, v)
+                if max_diff < tol:
+                    break
+            return v
+
+        if sp.issparse(P):
+            return _pe_csr(
+                indptr, indices, data, r, v, gamma, tol, max_iters, _CHECK_EVERY
+            )
+        return _pe_loop(P, r, v, gamma, tol, max_iters, _CHECK_EVERY)
+
+    # Bellman update v_new = r + gamma * (P @ v), written into preallocated
+    # buffers so no S-sized temporaries are created per iteration.
+    v_new = np.empty_like(r)
+    tmp = np.empty_like(r)
+    for it in range(max_iters):
+        if sp.issparse(P):
+            tmp[:] = P.dot(v)
+        else:
+            np.dot(P, v, out=tmp)
+        np.multiply(tmp, gamma, out=v_new)
+        np.add(v_new, r, out=v_new)
 
-    v = np.zeros_like(r)
-    for _ in range(max_iters):
-        v_new = bellman_update(v, P, r, gamma)
-        if np.max(np.abs(v_new - v)) < eps * (1 - gamma) / gamma:
-            break
-        v = v_new
+        if (it + 1) % _CHECK_EVERY == 0:
+            np.subtract(v_new, v, out=tmp)
+            np.abs(tmp, out=tmp)
+            if tmp.max() < tol:
+                break
+        v, v_new = v_new, v
 
     return v
@@ -1,5 +1,8 @@
 from __future__ import annotations
 from typing import Tuple, List, Optional
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
 import numpy as np
 
 from my_policy import MyPolicy
@@ -9,12 +12,18 @@ from bellman import exact_policy_evaluation
 from policy_eval import iterative_policy_evaluation
 from mdp import MDP
 
+# Last iterative solution per P.shape, used by run(..., warm_start=True) to
+# warm-start the next iterative evaluation of an MDP with the same state space.
+_warm_start: dict = {}
+
 
 def run(
     mdp: MDP,
     gamma: float,
     rng: Optional[np.random.Generator] = None,
     method: str = "exact",
+    plot: bool = True,
+    warm_start: bool = False,
 ):
     """
     Build a value-free policy for the given MDP, evaluate it, and report fitness.
@@ -30,6 +39,12 @@ def run(
         Randomness source used inside the policy constructor (if needed).
     method : {"exact","iterative"}
         Which policy evaluation method to use.
+    plot : bool
+        Whether to draw the policy with plot_policy.
+    warm_start : bool
+        For method="iterative", start from the last iterative solution of an
+        MDP with the same number of states instead of zeros. Results then
+        depend on earlier runs, within the iteration tolerance.
 
     Returns
     -------
@@ -41,18 +56,21 @@ def run(
     if rng is None:
         rng = np.random.default_rng()
 
-    pi = MyPolicy(mdp, rng)
-
     states = list(enumerate_states(mdp))
     state_idx = {s: i for i, s in enumerate(states)}
     S = len(states)
 
+    pi = MyPolicy(mdp, rng, states=states, state_idx=state_idx)
+
     P, r = build_policy_Pr(mdp, pi, states)
 
     if method == "exact":
         v = exact_policy_evaluation(P, r, gamma)
     elif method == "iterative":
-        v = iterative_policy_evaluation(P, r, gamma)
+        v0 = _warm_start.get(P.shape) if warm_start else None
+        v = iterative_policy_evaluation(P, r, gamma, v0=v0)
+        if warm_start:
+            _warm_start[P.shape] = v.copy()
     else:
         raise ValueError(f"Unknown method '{method}'")
 
@@ -61,7 +79,78 @@ def run(
 
     print(f"Fitness of constructed policy: f^π̂ = v^π̂(s₀) = {f_pi:.6f}")
 
-    plot_policy(pi) 
+    if plot:
+        plot_policy(pi)
 
     return pi, v, f_pi
 
+
+# Thread-count variables for BLAS/OpenMP/numba in worker processes: each run is
+# already one process, so nested threading would only oversubscribe the cores.
+_SINGLE_THREAD_ENV = {
+    "OMP_NUM_THREADS": "1",
+    "OPENBLAS_NUM_THREADS": "1",
+    "MKL_NUM_THREADS": "1",
+    "NUMBA_NUM_THREADS": "1",
+}
+
+
+def _run_one(config):
+    mdp, gamma, seed, method = config
+    return run(mdp, gamma, np.random.default_rng(seed), method, plot=False)
+
+
+def run_many(
+    mdp_list: List[MDP],
+    gamma: float,
+    seeds: List[int],
+    method: str = "exact",
+    max_workers: Optional[int] = None,
+) -> List[Tuple[MyPolicy, np.ndarray, float]]:
+    """
+    Call run() for every (mdp, seed) pair in parallel worker processes.
+
+    Workers are spawned with single-threaded BLAS/numba so that the processes,
+    not the libraries, use the cores. Because workers are spawned, callers must
+    invoke this under an ``if __name__ == "__main__":`` guard.
+
+    Parameters
+    ----------
+    mdp_list : list of MDP
+        Environments to evaluate; must be picklable.
+    gamma : float
+        Discount factor in (0,1].
+    seeds : list of int
+        Seeds for the rng of each run; every MDP is run with every seed.
+    method : {"exact","iterative"}
+        Which policy evaluation method to use.
+    max_workers : int, optional
+        Number of worker processes (defaults to the CPU count).
+
+    Returns
+    -------
+    list of (pi, v, f_pi), ordered as ``[(m, s) for m in mdp_list for s in seeds]``.
+    """
+    configs = [(mdp, gamma, seed, method) for mdp in mdp_list for seed in seeds]
+    if not configs:
+        return []
+
+    workers = max_workers or os.cpu_count() or 1
+    chunksize = max(1, len(configs) // (4 * workers))
+
+    # Spawned workers inherit the environment at start-up, before they import
+    # numpy/numba, so set the thread limits here and restore them afterwards.
+    saved = {k: os.environ.get(k) for k in _SINGLE_THREAD_ENV}
+    os.environ.update(_SINGLE_THREAD_ENV)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            return list(pool.map(_run_one, configs, chunksize=chunksize))
+    finally:
+        for k, val in saved.items():
+            if val is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = val
+